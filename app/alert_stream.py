@@ -0,0 +1,66 @@
+import threading
+
+
+class AlertStream:
+    """Registro degli alert con numero di sequenza crescente.
+
+    Ogni alert riceve un `seq` monotono, così i client possono chiedere solo
+    gli alert successivi a un cursore invece di riscaricare tutta la lista.
+    `publish` va chiamato nel punto in cui l'alert viene generato (vedi
+    `AlertManager.on_alert`), così ogni alert riceve un solo numero.
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._entries = []      # lista di (seq, alert), seq contigui
+        self._next_seq = 1
+        self._cond = threading.Condition()
+
+    @property
+    def last_seq(self):
+        with self._cond:
+            return self._next_seq - 1
+
+    def publish(self, alert):
+        """Assegna il prossimo numero di sequenza a un alert e sveglia i client in attesa."""
+        with self._cond:
+            self._append(alert)
+            self._cond.notify_all()
+
+    def snapshot(self, seq=0):
+        """Restituisce gli alert con `seq` maggiore del cursore e lo stato del registro.
+
+        Se il cursore è oltre l'ultimo seq (ad esempio dopo un riavvio del
+        processo) riparte da zero e imposta `reset`. `first_seq` permette al
+        client di capire se alcuni alert sono stati scartati.
+        """
+        with self._cond:
+            return self._snapshot(seq)
+
+    def wait_snapshot(self, seq, timeout=None):
+        """Come `snapshot`, ma attende fino a `timeout` secondi se non c'è nulla di nuovo."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._next_seq - 1 != seq, timeout=timeout)
+            return self._snapshot(seq)
+
+    def _append(self, alert):
+        self._entries.append((self._next_seq, alert))
+        self._next_seq += 1
+        # Scarta gli alert più vecchi a blocchi per non pagare lo shift a ogni inserimento
+        if len(self._entries) > self.max_size * 2:
+            del self._entries[:-self.max_size]
+
+    def _snapshot(self, seq):
+        last_seq = self._next_seq - 1
+        reset = seq > last_seq
+        if reset:
+            seq = 0
+        first_seq = self._entries[0][0] if self._entries else self._next_seq
+        start = max(0, seq - first_seq + 1)
+        return {
+            'alerts': [{'seq': s, 'alert': a} for s, a in self._entries[start:]],
+            'first_seq': first_seq,
+            'last_seq': last_seq,
+            'reset': reset,
+        }
+
@@ -1,4 +1,5 @@
 from .cache import SimpleCache
+from .alert_stream import AlertStream
 from functools import wraps
 from .models import MeasurementReplicationManager
 from broker import send_to_broker
@@ -6,9 +7,10 @@ from statistics import stdev
 import random
 import time
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, current_app  
+from flask import Flask, Response, request, jsonify, render_template, current_app, stream_with_context, json  
 
 replication_manager = None  # sarà inizializzato una volta sola
+alert_stream = AlertStream()  # alert numerati per polling incrementale e SSE
 
 # Definisce i valori di configurazione predefiniti
 nodes_db = 3
@@ -16,6 +18,8 @@ port = 5000
 API_TOKEN = "your_api_token_here"
 BROKER_URL = "localhost"
 BROKER_PORT = 5672
+ALERT_STREAM_MAX_SECONDS = 300  # dopo questo tempo lo stream si chiude e il client si riconnette
+ALERT_STREAM_KEEPALIVE = 15
 
 # Decorator per richiedere un token API valido
 def require_api_token(f):
@@ -26,6 +30,11 @@ def require_api_token(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Serializza un evento SSE con l'encoder JSON di Flask, lo stesso usato da jsonify
+def format_sse(data, event='alert', event_id=None):
+    message = f"id: {event_id}\n" if event_id is not None else ""
+    return message + f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 # Funzione per registrare le routes con l'app Flask
 def register_routes(app, config):
     global nodes_db, port, API_TOKEN, BROKER_URL, BROKER_PORT, replication_manager
@@ -46,6 +55,9 @@ def register_routes(app, config):
             strategy=strategy,
             replication_factor=replication_factor
         )
+
+    # L'AlertManager chiama on_alert per ogni alert generato in store_measurement
+    replication_manager.alert_manager.on_alert = alert_stream.publish
     
     # Endpoint di default per verificare lo stato del servizio
     @app.route('/')
@@ -272,10 +284,60 @@ def register_routes(app, config):
     @require_api_token
     def get_alerts():
         try:
+            since = request.args.get('since', type=int)
+            if since is not None:
+                # Restituisce solo gli alert successivi al cursore
+                snapshot = alert_stream.snapshot(since)
+                return jsonify({'status': 'success', **snapshot})
+            # Cursore letto prima della lista: un alert concorrente può al più ripetersi al poll successivo
+            last_seq = alert_stream.last_seq
             alerts = replication_manager.alert_manager.get_alerts()
-            return jsonify({'status': 'success', 'alerts': alerts})
+            return jsonify({'status': 'success', 'alerts': alerts, 'last_seq': last_seq})
         except Exception as e:
             return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+    # Stream Server-Sent Events: invia i nuovi alert appena vengono generati
+    @app.route('/alerts/stream', methods=['GET'])
+    @require_api_token
+    def stream_alerts():
+        # Last-Event-ID (riconnessione automatica del browser) ha la precedenza su ?since=;
+        # senza cursore lo stream parte dagli alert futuri
+        cursor = request.headers.get('Last-Event-ID') or request.args.get('since')
+        if cursor is None:
+            since = alert_stream.last_seq
+        else:
+            try:
+                since = int(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid input', 'message': 'Last-Event-ID and since must be integers'}), 400
+
+        def generate(cursor):
+            deadline = time.monotonic() + ALERT_STREAM_MAX_SECONDS
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    snapshot = alert_stream.wait_snapshot(
+                        cursor, timeout=min(ALERT_STREAM_KEEPALIVE, remaining))
+                    if snapshot['reset']:
+                        # Cursore di un processo precedente: il client deve ripartire da capo
+                        yield format_sse({'first_seq': snapshot['first_seq'],
+                                          'last_seq': snapshot['last_seq']}, event='reset')
+                        cursor = snapshot['last_seq']
+                    if not snapshot['alerts']:
+                        if not snapshot['reset']:
+                            yield ": keep-alive\n\n"
+                        continue
+                    for entry in snapshot['alerts']:
+                        yield format_sse(entry, event_id=entry['seq'])
+                    cursor = snapshot['alerts'][-1]['seq']
+            except Exception as e:
+                yield format_sse({'error': 'Internal server error', 'message': str(e)}, event='error')
+
+        return Response(stream_with_context(generate(since)),
+                        mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
         
     @app.route('/alerts/recent', methods=['GET'])
     @require_api_token
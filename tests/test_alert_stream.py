@@ -0,0 +1,182 @@
+import importlib
+import json
+import sys
+import threading
+import types
+
+import pytest
+
+from app.alert_stream import AlertStream
+
+
+def _alert(i):
+    return {'sensor_id': f'sensor{i}', 'value': 80 + i}
+
+
+def test_publish_assigns_contiguous_seq():
+    stream = AlertStream()
+    for i in range(3):
+        stream.publish(_alert(i))
+
+    snapshot = stream.snapshot(0)
+    assert [e['seq'] for e in snapshot['alerts']] == [1, 2, 3]
+    assert [e['alert'] for e in snapshot['alerts']] == [_alert(0), _alert(1), _alert(2)]
+    assert snapshot['last_seq'] == 3
+
+
+def test_publish_concurrent_does_not_duplicate():
+    stream = AlertStream()
+    threads = [threading.Thread(target=stream.publish, args=(_alert(i),)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snapshot = stream.snapshot(0)
+    assert [e['seq'] for e in snapshot['alerts']] == list(range(1, 51))
+    assert sorted(e['alert']['value'] for e in snapshot['alerts']) == [80 + i for i in range(50)]
+
+
+def test_publish_identical_alerts_get_distinct_seq():
+    stream = AlertStream()
+    for _ in range(3):
+        stream.publish({'v': 1})
+    assert stream.last_seq == 3
+
+
+def test_snapshot_since_cursor():
+    stream = AlertStream()
+    for i in range(5):
+        stream.publish(_alert(i))
+
+    snapshot = stream.snapshot(3)
+    assert [e['seq'] for e in snapshot['alerts']] == [4, 5]
+    assert snapshot['reset'] is False
+    assert stream.snapshot(5)['alerts'] == []
+
+
+def test_snapshot_eviction_reports_first_seq():
+    stream = AlertStream(max_size=2)
+    for i in range(5):
+        stream.publish(_alert(i))
+
+    snapshot = stream.snapshot(0)
+    assert snapshot['first_seq'] == 4
+    assert [e['seq'] for e in snapshot['alerts']] == [4, 5]
+
+
+def test_snapshot_cursor_past_end_resets():
+    stream = AlertStream()
+    stream.publish(_alert(0))
+
+    snapshot = stream.snapshot(500)
+    assert snapshot['reset'] is True
+    assert [e['seq'] for e in snapshot['alerts']] == [1]
+
+
+def test_wait_snapshot_times_out_without_new_alerts():
+    stream = AlertStream()
+    stream.publish(_alert(0))
+    assert stream.wait_snapshot(1, timeout=0.05)['alerts'] == []
+
+
+# --- Endpoint ---
+
+class FakeAlertManager:
+    def __init__(self):
+        self.alerts = []
+        self.on_alert = None
+
+    def get_alerts(self):
+        return list(self.alerts)
+
+    def raise_alert(self, alert):
+        self.alerts.append(alert)
+        if self.on_alert is not None:
+            self.on_alert(alert)
+
+
+class FakeReplicationManager:
+    def __init__(self):
+        self.alert_manager = FakeAlertManager()
+
+    def store_measurement(self, key, value):
+        if value > 70:
+            self.alert_manager.raise_alert({'key': key, 'value': value})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    pytest.importorskip('flask')
+    from flask import Flask
+
+    # cache, models e broker non fanno parte di questo repository: bastano moduli vuoti
+    # perché app.routes si importi, il replication manager viene sostituito sotto
+    for name, attrs in (('app.cache', {'SimpleCache': object}),
+                        ('app.models', {'MeasurementReplicationManager': object}),
+                        ('broker', {'send_to_broker': None})):
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__dict__.update(attrs)
+            monkeypatch.setitem(sys.modules, name, module)
+    routes = importlib.import_module('app.routes')
+
+    monkeypatch.setattr(routes, 'replication_manager', FakeReplicationManager())
+    monkeypatch.setattr(routes, 'alert_stream', AlertStream())
+    monkeypatch.setattr(routes, 'send_to_broker', lambda *args, **kwargs: None)
+    monkeypatch.setattr(routes, 'ALERT_STREAM_MAX_SECONDS', 0.1)
+
+    app = Flask(__name__)
+    routes.register_routes(app, {'nodes_db': 3, 'port': 5000, 'API_TOKEN': 'test'})
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = 'Bearer test'
+    return client
+
+
+def _ingest(client, sensor_id, value):
+    return client.post('/ingest', json={'sensor_id': sensor_id, 'timestamp': '2024-01-01T00:00:00',
+                                        'value': value})
+
+
+def test_alerts_since_endpoint(client):
+    _ingest(client, 'sensor1', 90)
+    _ingest(client, 'sensor2', 50)
+    _ingest(client, 'sensor3', 95)
+
+    data = client.get('/alerts?since=1').get_json()
+    assert [e['seq'] for e in data['alerts']] == [2]
+    assert data['alerts'][0]['alert']['value'] == 95
+    assert data['last_seq'] == 2
+
+
+def test_alerts_stream_endpoint(client):
+    _ingest(client, 'sensor1', 90)
+
+    response = client.get('/alerts/stream?since=0')
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert body.startswith('id: 1\nevent: alert\ndata: ')
+    entry = json.loads(body.split('data: ', 1)[1].split('\n', 1)[0])
+    assert entry['alert']['value'] == 90
+
+
+def test_alerts_without_since_returns_manager_list(client):
+    _ingest(client, 'sensor1', 90)
+
+    data = client.get('/alerts').get_json()
+    assert data['alerts'] == [{'key': 'sensor1:2024-01-01T00:00:00', 'value': 90}]
+    assert data['last_seq'] == 1
+
+
+def test_alerts_stream_last_event_id_takes_precedence(client):
+    _ingest(client, 'sensor1', 90)
+    _ingest(client, 'sensor2', 95)
+
+    body = client.get('/alerts/stream?since=0', headers={'Last-Event-ID': '1'}).get_data(as_text=True)
+    assert 'id: 1\n' not in body
+    assert body.startswith('id: 2\n')
+
+
+def test_alerts_stream_invalid_cursor(client):
+    response = client.get('/alerts/stream', headers={'Last-Event-ID': 'abc'})
+    assert response.status_code == 400